@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""Camera, viewport transforms and QuadTree-backed entity culling"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Protocol
+
+import pygame
+
+from coordinate import Coordinate
+from quad_tree import QuadTree, Rect
+
+
+class CullableEntity(Protocol):
+    position: Coordinate
+
+    def update(self, game: Any, ticks: int) -> None:
+        """Advances by ticks, the ticks elapsed since this entity's last update:
+        1 while visible, up to distant_update_interval while off-screen"""
+        ...
+
+    def render(self, screen: pygame.surface.Surface, camera: Camera) -> None:
+        """Draws at camera.world_to_screen(self.position)"""
+        ...
+
+
+@dataclass
+class Camera:
+    """Scrollable view onto the world, with world <-> screen transforms"""
+
+    size: Coordinate
+    position: Coordinate = Coordinate()
+    margin: float = 32
+
+    def world_to_screen(self, point: Coordinate) -> Coordinate:
+        return Coordinate(point.x - self.position.x, point.y - self.position.y)
+
+    def screen_to_world(self, point: Coordinate) -> Coordinate:
+        return Coordinate(point.x + self.position.x, point.y + self.position.y)
+
+    def scroll(self, delta: Coordinate) -> None:
+        self.position = self.position + delta
+
+    def centre_on(self, point: Coordinate) -> None:
+        self.position = Coordinate(point.x - self.size.x / 2, point.y - self.size.y / 2)
+
+    def clamp(self, world: Rect) -> None:
+        """Keeps the view inside the world boundary"""
+        max_x = world.position.x + max(world.size.x - self.size.x, 0)
+        max_y = world.position.y + max(world.size.y - self.size.y, 0)
+        self.position = Coordinate(
+            min(max(self.position.x, world.position.x), max_x),
+            min(max(self.position.y, world.position.y), max_y),
+        )
+
+    @property
+    def rect(self) -> Rect:
+        return Rect(self.position, self.size)
+
+    @property
+    def culling_rect(self) -> Rect:
+        """View rect grown by the margin, so partially visible entities are kept"""
+        margin = self.margin
+        return Rect(
+            Coordinate(self.position.x - margin, self.position.y - margin),
+            Coordinate(self.size.x + 2 * margin, self.size.y + 2 * margin),
+        )
+
+
+@dataclass
+class CullingStats:
+    entities: int = 0
+    rendered: int = 0
+    updated: int = 0
+    throttled: int = 0
+
+
+class EntityCuller:
+    """Holds world entities in a QuadTree; renders only visible ones and
+    updates distant ones every distant_update_interval ticks"""
+
+    def __init__(self, world: Rect, distant_update_interval: int = 10, max_points: int = 8):
+        self.world = world
+        self.distant_update_interval = distant_update_interval
+        self.quad_tree = QuadTree(world, max_points=max_points)
+        self.entities: List[CullableEntity] = []
+        self.stats = CullingStats()
+        self._positions: Dict[int, Coordinate] = {}
+        self._outside: Dict[int, CullableEntity] = {}
+        self._last_update: Dict[int, int] = {}
+        self._visible: List[CullableEntity] = []
+
+    def add(self, entity: CullableEntity) -> None:
+        self.entities.append(entity)
+        self._insert(entity)
+
+    def remove(self, entity: CullableEntity) -> None:
+        self.entities = [x for x in self.entities if x is not entity]
+        position = self._positions.pop(id(entity), None)
+        self._last_update.pop(id(entity), None)
+        if self._outside.pop(id(entity), None) is None:
+            self.quad_tree.remove(entity, position)
+
+    def update(self, game: Any, camera: Camera) -> None:
+        self._refresh_moved()
+        self._visible = self.find_visible(camera)
+        visible_ids = {id(entity) for entity in self._visible}
+        interval = max(self.distant_update_interval, 1)
+        tick: int = game.tick
+
+        updated = 0
+        last_update = self._last_update
+        for index, entity in enumerate(self.entities):
+            if id(entity) in visible_ids or (tick + index) % interval == 0:
+                entity.update(game, tick - last_update.get(id(entity), tick - 1))
+                last_update[id(entity)] = tick
+                updated += 1
+
+        self.stats = CullingStats(
+            entities=len(self.entities),
+            rendered=len(self._visible),
+            updated=updated,
+            throttled=len(self.entities) - updated,
+        )
+
+    def render(self, screen: pygame.surface.Surface, camera: Camera) -> None:
+        for entity in self._visible:
+            entity.render(screen, camera)
+
+    def find_visible(self, camera: Camera) -> List[CullableEntity]:
+        rect = camera.culling_rect
+        visible: List[CullableEntity] = list(self.quad_tree.find(rect))  # type: ignore
+        visible.extend(x for x in self._outside.values() if rect.contains(x.position))
+        return visible
+
+    def _insert(self, entity: CullableEntity) -> None:
+        self._positions[id(entity)] = entity.position
+        if not self.quad_tree.insert(entity):
+            self._outside[id(entity)] = entity
+
+    def _refresh_moved(self) -> None:
+        for entity in self.entities:
+            old_position = self._positions[id(entity)]
+            if entity.position == old_position:
+                continue
+            if self._outside.pop(id(entity), None) is None:
+                self.quad_tree.remove(entity, old_position)
+            self._insert(entity)
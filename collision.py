@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""Batched collision queries with swept AABB time of impact"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+from coordinate import Coordinate
+from quad_tree import QuadTree, Rect
+
+Box = Tuple[float, float, float, float]  # x, y, width, height
+Velocity = Tuple[float, float]
+
+OVERSIZED_FACTOR = 4  # boxes this many times the median swept extent skip the QuadTree
+
+
+@dataclass(frozen=True)
+class Contact:
+    """Collision between boxes first and second at time (fraction of the step).
+
+    normal is the surface normal of second at the contact, pointing towards first.
+    """
+
+    first: int
+    second: int
+    time: float
+    normal: Coordinate
+
+
+class _SweptBox:
+    __slots__ = ("index", "position")
+
+    def __init__(self, index: int, position: Coordinate):
+        self.index = index
+        self.position = position
+
+
+def find_contacts(
+    boxes: Sequence[Box],
+    velocities: Optional[Sequence[Velocity]] = None,
+    max_points: int = 8,
+) -> List[Contact]:
+    """Returns all contacts between boxes moving by velocities over one step,
+    sorted by time of impact. Boxes overlapping at the start have time 0."""
+    if not boxes:
+        return []
+    if velocities is None:
+        velocities = [(0, 0)] * len(boxes)
+
+    swept = [
+        (min(x, x + vx), min(y, y + vy), w + abs(vx), h + abs(vy))
+        for (x, y, w, h), (vx, vy) in zip(boxes, velocities)
+    ]
+    small, large = _split_oversized(swept)
+    tree = _build_tree(swept, small, max_points)
+    max_width = max((swept[index][2] for index in small), default=0)
+    max_height = max((swept[index][3] for index in small), default=0)
+
+    contacts: List[Contact] = []
+
+    def narrow_phase(first: int, second: int) -> None:
+        ax, ay, aw, ah = swept[first]
+        bx, by, bw, bh = swept[second]
+        if ax >= bx + bw or bx >= ax + aw or ay >= by + bh or by >= ay + ah:
+            return
+        contact = sweep(boxes[first], velocities[first], boxes[second], velocities[second])  # type: ignore
+        if contact is not None:
+            time, normal_x, normal_y = contact
+            contacts.append(Contact(first, second, time, Coordinate(normal_x, normal_y)))
+
+    # small boxes: a box overlapping this one has its top-left corner at most
+    # one (small) box extent to the left / above, so the query only grows by that
+    for first in small:
+        x, y, w, h = swept[first]
+        query = Rect(
+            Coordinate(x - max_width, y - max_height),
+            Coordinate(w + max_width, h + max_height),
+        )
+        for candidate in tree.find(query):
+            second: int = candidate.index  # type: ignore
+            if second > first:
+                narrow_phase(first, second)
+
+    # oversized boxes (long walls, very fast projectiles) are tested against all
+    # boxes directly, so they do not widen every query above
+    large_set = set(large)
+    for first in large:
+        for second in range(len(swept)):
+            if second != first and (second not in large_set or second > first):
+                narrow_phase(*sorted((first, second)))
+
+    contacts.sort(key=lambda contact: contact.time)
+    return contacts
+
+
+def sweep(
+    first: Box, first_velocity: Velocity, second: Box, second_velocity: Velocity
+) -> Optional[Tuple[float, float, float]]:
+    """Swept AABB test; returns (time, normal x, normal y) or None if the boxes
+    do not touch within the step"""
+    ax, ay, aw, ah = first
+    bx, by, bw, bh = second
+    vx = first_velocity[0] - second_velocity[0]
+    vy = first_velocity[1] - second_velocity[1]
+
+    if vx > 0:
+        entry_x, exit_x = (bx - ax - aw) / vx, (bx + bw - ax) / vx
+    elif vx < 0:
+        entry_x, exit_x = (bx + bw - ax) / vx, (bx - ax - aw) / vx
+    elif ax + aw <= bx or bx + bw <= ax:
+        return None
+    else:
+        entry_x, exit_x = -math.inf, math.inf
+
+    if vy > 0:
+        entry_y, exit_y = (by - ay - ah) / vy, (by + bh - ay) / vy
+    elif vy < 0:
+        entry_y, exit_y = (by + bh - ay) / vy, (by - ay - ah) / vy
+    elif ay + ah <= by or by + bh <= ay:
+        return None
+    else:
+        entry_y, exit_y = -math.inf, math.inf
+
+    entry = max(entry_x, entry_y)
+    exit_ = min(exit_x, exit_y)
+    if entry >= exit_ or entry >= 1 or exit_ <= 0:
+        return None
+
+    if entry < 0:
+        return (0.0, *_overlap_normal(first, second))
+    if entry_x > entry_y:
+        return entry, (-1.0 if vx > 0 else 1.0), 0.0
+    return entry, 0.0, (-1.0 if vy > 0 else 1.0)
+
+
+def _overlap_normal(first: Box, second: Box) -> Tuple[float, float]:
+    ax, ay, aw, ah = first
+    bx, by, bw, bh = second
+    penetration_x = min(ax + aw - bx, bx + bw - ax)
+    penetration_y = min(ay + ah - by, by + bh - ay)
+    if penetration_x < penetration_y:
+        return (1.0 if ax + aw / 2 >= bx + bw / 2 else -1.0), 0.0
+    return 0.0, (1.0 if ay + ah / 2 >= by + bh / 2 else -1.0)
+
+
+def _split_oversized(swept: List[Box]) -> Tuple[List[int], List[int]]:
+    """Splits box indices into regular ones and those much larger than the median"""
+    extents = sorted(max(box[2], box[3]) for box in swept)
+    limit = OVERSIZED_FACTOR * extents[len(extents) // 2]
+    small: List[int] = []
+    large: List[int] = []
+    for index, box in enumerate(swept):
+        (large if max(box[2], box[3]) > limit else small).append(index)
+    return small, large
+
+
+def _build_tree(swept: List[Box], indices: List[int], max_points: int) -> QuadTree:
+    if not indices:
+        return QuadTree(Rect(Coordinate(), Coordinate()), max_points=max_points)
+    left = min(swept[index][0] for index in indices)
+    top = min(swept[index][1] for index in indices)
+    right = max(swept[index][0] for index in indices)
+    bottom = max(swept[index][1] for index in indices)
+    tree = QuadTree(
+        Rect(Coordinate(left, top), Coordinate(right - left + 1, bottom - top + 1)),
+        max_points=max_points,
+    )
+    for index in indices:
+        box = swept[index]
+        tree.insert(_SweptBox(index, Coordinate(box[0], box[1])))
+    return tree
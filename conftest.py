@@ -0,0 +1,6 @@
+# pylint: disable=missing-docstring
+
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+"""Garbage collector pause control and per-frame allocation tracking"""
+
+from __future__ import annotations
+
+import gc
+import logging
+import os
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class GcPause:
+    tick: int
+    generation: int
+    duration: float
+    collected: int
+
+
+@dataclass
+class FrameAllocations:
+    """Net growth of live traced memory blocks since the previous frame.
+
+    tracemalloc snapshots only see blocks that are still alive, so temporaries
+    allocated and freed within the frame are not counted.
+    """
+
+    tick: int
+    retained_blocks: int
+    retained_bytes: int
+    by_subsystem: Dict[str, int]
+
+
+@dataclass
+class GcPolicy:
+    """Keeps cyclic garbage collection out of busy frames.
+
+    Call freeze() once assets are loaded and start() when gameplay begins;
+    end_frame() then collects a generation that passed its gc threshold, but
+    only if the frame's spare time covers its estimated pause (otherwise a
+    younger one). The young generation is collected regardless once its count
+    passes max_deferral times its threshold.
+    """
+
+    frame_budget: float
+    min_spare: float = 0.004
+    max_deferral: int = 10
+    pause_margin: float = 1.5
+    debug: bool = False
+    max_records: int = 1000
+
+    def __post_init__(self):
+        self.tick = 0
+        self.pauses: List[GcPause] = []
+        self.allocations: List[FrameAllocations] = []
+        self._pause_start: Optional[float] = None
+        self._snapshot: Optional[tracemalloc.Snapshot] = None
+        self._thresholds = gc.get_threshold()
+        self._estimated_pause: List[Optional[float]] = [None, None, None]
+        self._long_lived_total = 0
+        self._long_lived_pending = 0
+        self._young_survivors = 0
+
+    def freeze(self) -> None:
+        gc.collect()
+        gc.freeze()
+        self._count_long_lived()
+
+    def start(self) -> None:
+        gc.disable()
+        if self._on_gc not in gc.callbacks:
+            gc.callbacks.append(self._on_gc)
+        if self.debug and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def stop(self) -> None:
+        gc.enable()
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._snapshot = None
+
+    def collect_full(self) -> None:
+        """Full collection for pauses the player will not notice, e.g. loading
+        screens, since a large heap may never leave enough spare frame time"""
+        self._collect(2)
+        self._count_long_lived()
+
+    def end_frame(self, frame_time: float) -> None:
+        """Called after the frame's work, before the frame limiter sleeps"""
+        if self.debug:
+            self._track_allocations()
+        due = self._generation_due()
+        if due is not None:
+            spare = self.frame_budget - frame_time
+            for generation in range(due, -1, -1):
+                if spare >= self._required_spare(generation):
+                    self._collect(generation)
+                    break
+            else:
+                if gc.get_count()[0] >= self._thresholds[0] * self.max_deferral:
+                    self._collect(0)
+        self.tick += 1
+
+    def _generation_due(self) -> Optional[int]:
+        # like CPython, a full collection also waits until the objects promoted since
+        # the last one exceed a quarter of the long-lived objects
+        counts = gc.get_count()
+        if counts[2] >= self._thresholds[2] and self._long_lived_pending > self._long_lived_total / 4:
+            return 2
+        if counts[1] >= self._thresholds[1]:
+            return 1
+        if counts[0] >= self._thresholds[0]:
+            return 0
+        return None
+
+    def _required_spare(self, generation: int) -> float:
+        estimate = self._estimated_pause[generation]
+        if estimate is None:
+            return self.min_spare * 2 ** generation  # no pauses measured yet, assume older is slower
+        return max(self.min_spare, estimate * self.pause_margin)
+
+    def _collect(self, generation: int) -> None:
+        # object counts are estimated from the gen-0 count (net new objects since
+        # the last collection), as enumerating the heap would cost more than the pause
+        new = gc.get_count()[0]
+        collected = gc.collect(generation)
+        if generation == 0:
+            self._young_survivors += max(new - collected, 0)
+        elif generation == 1:
+            self._long_lived_pending += max(self._young_survivors + new - collected, 0)
+            self._young_survivors = 0
+        else:
+            self._long_lived_total = max(
+                self._long_lived_total + self._long_lived_pending + self._young_survivors + new - collected, 0
+            )
+            self._long_lived_pending = 0
+            self._young_survivors = 0
+
+    def _count_long_lived(self) -> None:
+        """Exact count of long-lived objects, only for loading screens"""
+        self._long_lived_total = len(gc.get_objects(2))
+        self._long_lived_pending = 0
+        self._young_survivors = 0
+
+    def _on_gc(self, phase: str, info: Dict[str, Any]) -> None:
+        if phase == "start":
+            self._pause_start = time.perf_counter()
+            return
+
+        if self._pause_start is None:
+            return
+        pause = GcPause(
+            tick=self.tick,
+            generation=info["generation"],
+            duration=time.perf_counter() - self._pause_start,
+            collected=info["collected"],
+        )
+        self._pause_start = None
+        self._append(self.pauses, pause)
+        estimate = self._estimated_pause[pause.generation]
+        self._estimated_pause[pause.generation] = (
+            pause.duration if estimate is None else 0.7 * estimate + 0.3 * pause.duration
+        )
+        if self.debug and pause.duration > self.frame_budget / 4:
+            logging.info("Long GC pause: %s", pause)
+
+    def _track_allocations(self) -> None:
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__))
+        )
+        previous, self._snapshot = self._snapshot, snapshot
+        if previous is None:
+            return
+
+        count = size = 0
+        by_subsystem: Dict[str, int] = {}
+        for stat in snapshot.compare_to(previous, "filename"):
+            if stat.count_diff <= 0:
+                continue
+            count += stat.count_diff
+            size += stat.size_diff
+            subsystem = os.path.basename(stat.traceback[0].filename)
+            by_subsystem[subsystem] = by_subsystem.get(subsystem, 0) + stat.count_diff
+        self._append(self.allocations, FrameAllocations(self.tick, count, size, by_subsystem))
+
+    def _append(self, records: List[Any], record: Any) -> None:
+        records.append(record)
+        if len(records) > self.max_records:
+            del records[: len(records) - self.max_records]
+
+
+@dataclass
+class GcReport:
+    pauses: int = 0
+    total_pause: float = 0
+    max_pause: float = 0
+    mean_retained_blocks: float = 0
+    top_subsystems: List[Any] = field(default_factory=list)
+
+    @classmethod
+    def from_policy(cls, policy: GcPolicy) -> GcReport:
+        by_subsystem: Dict[str, int] = {}
+        for frame in policy.allocations:
+            for subsystem, count in frame.by_subsystem.items():
+                by_subsystem[subsystem] = by_subsystem.get(subsystem, 0) + count
+        frames = len(policy.allocations)
+        return cls(
+            pauses=len(policy.pauses),
+            total_pause=sum(x.duration for x in policy.pauses),
+            max_pause=max((x.duration for x in policy.pauses), default=0),
+            mean_retained_blocks=sum(x.retained_blocks for x in policy.allocations) / frames if frames else 0,
+            top_subsystems=sorted(by_subsystem.items(), key=lambda x: -x[1])[:10],
+        )
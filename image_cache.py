@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""Image loading with display format normalization and an LRU memory budget"""
+
+from __future__ import annotations
+
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple, Union
+
+import pygame
+
+from surfaces import surface_bytes
+
+Surface = pygame.surface.Surface
+PathLike = Union[os.PathLike, str]
+ImageKey = Tuple[str, bool, Optional[Tuple[int, int]], float]
+
+
+@dataclass
+class ImageCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0
+
+
+@dataclass
+class _Entry:
+    surface: Surface
+    converted: bool
+
+
+class ImageCache:
+    """Deduplicates image loads by path and load parameters, caching scaled and
+    rotated variants. Images are converted to the display pixel format as soon as
+    a display exists, and least recently used entries are evicted once the
+    resident bytes exceed memory_budget.
+    """
+
+    def __init__(self, memory_budget: int = 64 * 1024 * 1024):
+        self.memory_budget = memory_budget
+        self.resident_bytes = 0
+        self.stats = ImageCacheStats()
+        self._entries: OrderedDict[ImageKey, _Entry] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def load(
+        self,
+        filepath: PathLike,
+        alpha: bool = True,
+        size: Optional[Tuple[int, int]] = None,
+        angle: float = 0,
+    ) -> Surface:
+        """Returns the image at filepath, optionally scaled to size and then rotated by angle degrees"""
+        key: ImageKey = (os.fspath(filepath), alpha, tuple(size) if size else None, angle % 360)  # type: ignore
+        if key in self._entries:
+            self.stats.hits += 1
+        else:
+            self.stats.misses += 1
+        return self._get(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.resident_bytes = 0
+
+    def _get(self, key: ImageKey) -> Surface:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            if not entry.converted:
+                self._replace(entry, self._normalize(entry.surface, key[1]))
+            return entry.surface
+
+        surface = self._create(key)
+        self._store(key, _Entry(surface, converted=self._display_ready()))
+        return surface
+
+    def _create(self, key: ImageKey) -> Surface:
+        """Builds variants from the cached unrotated / unscaled image, without counting them in the stats"""
+        filepath, alpha, size, angle = key
+        if angle:
+            return pygame.transform.rotate(self._get((filepath, alpha, size, 0)), angle)
+        if size:
+            return _scale(self._get((filepath, alpha, None, 0)), size)
+        return self._normalize(pygame.image.load(filepath), alpha)
+
+    def _normalize(self, surface: Surface, alpha: bool) -> Surface:
+        if not self._display_ready():
+            return surface
+        return surface.convert_alpha() if alpha else surface.convert()
+
+    @staticmethod
+    def _display_ready() -> bool:
+        return pygame.display.get_surface() is not None
+
+    def _replace(self, entry: _Entry, surface: Surface) -> None:
+        self.resident_bytes += surface_bytes(surface) - surface_bytes(entry.surface)
+        entry.surface = surface
+        entry.converted = self._display_ready()
+        self._evict()
+
+    def _store(self, key: ImageKey, entry: _Entry) -> None:
+        self._entries[key] = entry
+        self.resident_bytes += surface_bytes(entry.surface)
+        self._evict()
+
+    def _evict(self) -> None:
+        while self.resident_bytes > self.memory_budget and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self.resident_bytes -= surface_bytes(evicted.surface)
+            self.stats.evictions += 1
+
+
+def _scale(surface: Surface, size: Tuple[int, int]) -> Surface:
+    # smoothscale only supports 24 / 32 bit surfaces, e.g. not palettized images
+    # loaded before the display exists
+    if surface.get_bytesize() < 3:
+        return pygame.transform.scale(surface, size)
+    return pygame.transform.smoothscale(surface, size)
@@ -15,7 +15,8 @@ import os
 from pathlib import Path
 import pickle
 import random
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
 from typing import (
     Any,
     Callable,
@@ -30,23 +31,43 @@ from typing import (
 import pygame
 from pygame import gfxdraw
 
+from camera import Camera, EntityCuller
 from coordinate import Coordinate
 from error import log_exception, no_error
+from gc_policy import GcPolicy, GcReport
+from image_cache import ImageCache
 from particle import DynamicColour
+from quad_tree import Rect
+from replay import InputRecorder, Recording, ReplayResult, state_checksum
+from scene_stack import REPLACE, SceneStack
+from scheduler import FrameScheduler, Task, yield_now
 
 AUTHOR = "{}"
 GAME_TITLE = "{}"
 TITLE_FONT_SIZE = 70
+GAME_FONT_SIZE = 25
 SCREEN_SIZE = Coordinate(800, 600)
+WORLD_SIZE = SCREEN_SIZE # TODO: replace with real world size
+CULLING_MARGIN = 32
+DISTANT_UPDATE_INTERVAL = 10
 SAVE_FILEPATH = "game.sav"
 CONFIG_FILEPATH = "config.json"
 LOG_FILEPATH = "game.log"
+RECORDING_FILEPATH = "game.rec"
+RECORDING_SAVE_INTERVAL = 500 # ticks between recording autosaves
+DETERMINISTIC_BACKGROUND_STEPS = 8 # scheduler steps per frame while recording or replaying
+REPLAY_TRACE_FILEPATH = "replay_trace.csv"
 MUSIC_FILEPATH = "music.wav" # TODO: replace with real path
 ICON_FILEPATH = "icon.png" # TODO: replace with real path
 FPS = 50
+GC_MIN_SPARE_TIME = 0.004
+SCHEDULER_RESERVE_TIME = 0.006 # leaves frame time for the GC policy and display flip
 VOLUME_SCALING = 2
 BACKGROUND_COLOUR = (0, 0, 0)
 ASSETS_FOLDER = Path(__file__).parent
+GAME_IMAGE_FILEPATHS: List[str] = [] # TODO: add sprites to preload with the game scene
+GAME_TEXTS: List[str] = [] # TODO: add static texts to pre-render with the game scene
+IMAGE_MEMORY_BUDGET = 64 * 1024 * 1024
 
 Font = pygame.font.Font
 Surface = pygame.surface.Surface
@@ -84,10 +105,10 @@ class BaseEntity:
     assets = Assets.from_disk()
 
 class Entity(Protocol):
-    def update(self, game: GameScene) -> None:
+    def update(self, game: GameScene, ticks: int) -> None:
         ...
 
-    def render(self, screen: Surface) -> None:
+    def render(self, screen: Surface, camera: Camera) -> None:
         ...
 
 def default_game_over(game: GameScene) -> bool:
@@ -102,10 +123,30 @@ class GameScene:
     def __post_init__(self):
         self.over: bool = False
         self.just_over: bool = False
+        self.text_renderer = TextRenderer()
+        self.text_cache: Dict[str, Surface] = {}
+        self.camera = Camera(size=SCREEN_SIZE, margin=CULLING_MARGIN)
+        self.entities = EntityCuller(
+            world=Rect(Coordinate(), WORLD_SIZE),
+            distant_update_interval=DISTANT_UPDATE_INTERVAL,
+        )
+
+    def enter(self) -> None:
+        # called by the scene stack when the scene is pushed or swapped in, so that
+        # gameplay randomness starts from the logged seed however the scene was built
+        if self.seed is not None:
+            random.seed(self.seed)
 
     def update(self):
+        self.entities.update(self, self.camera)
         self._update_over()
 
+    def render(self, screen: Surface) -> None:
+        self.entities.render(screen, self.camera)
+
+    def handle_event(self, event: Event) -> None:
+        ...
+
     def _update_over(self):
         over = self.game_over_strategy(self)
         self.just_over = over and not self.over
@@ -116,11 +157,31 @@ class GameScene:
         return self.window.tick
 
 def init_game_scene(window: Window, seed: Optional[int] = None) -> GameScene:
-    seed = seed or random.randint(0, 100_000_000)
-    random.seed(seed)
+    seed = random.randint(0, 100_000_000) if seed is None else seed
     logging.info("Seed: %s", seed)
     return GameScene(window=window, game_over_strategy=default_game_over, seed=seed)
 
+async def load_game_scene(window: Window, seed: int) -> GameScene:
+    # builds the scene step by step in spare frame time, see preload_game_scene
+    # must not use the global RNG, which belongs to the running scene until this one is entered
+    game = GameScene(window=window, game_over_strategy=default_game_over, seed=seed)
+    await yield_now()
+    game.text_renderer = TextRenderer(font=init_font("", GAME_FONT_SIZE))
+    await yield_now()
+    for text in GAME_TEXTS:
+        game.text_cache[text] = game.text_renderer.render(text)
+        await yield_now()
+    for filepath in GAME_IMAGE_FILEPATHS:
+        load_image(filepath)
+        await yield_now()
+    return game
+
+def preload_game_scene(window: Window, seed: Optional[int] = None) -> Task:
+    # the seed is drawn now rather than at a timing dependent frame of the background task
+    seed = random.randint(0, 100_000_000) if seed is None else seed
+    logging.info("Seed: %s", seed)
+    return window.scenes.preload(load_game_scene(window, seed), transition=REPLACE)
+
 @dataclass
 class TextRenderer:
     font: Optional[Font] = None
@@ -141,8 +202,12 @@ class Window:
     running: bool = True
     muted: bool = False
     tick: int = 0
+    recorder: Optional[InputRecorder] = None
+    gc_policy: Optional[GcPolicy] = None
+    scheduler: FrameScheduler = field(default_factory=lambda: FrameScheduler(frame_budget=1 / FPS))
 
     def update(self):
+        start = time.perf_counter()
         self._update_volume()
         if self.scene:
             self.scene.update()
@@ -150,7 +215,11 @@ class Window:
         if self.scene:
             self.scene.render(self.screen)
         pygame.display.flip()
-        self.clock.tick(FPS)
+        self.scheduler.run_background(frame_start=start)
+        if self.gc_policy:
+            self.gc_policy.end_frame(time.perf_counter() - start)
+        self.clock.tick()  # frame pacing is done by the scheduler, this only tracks fps
+        self.tick += 1
 
     @no_error
     def _update_volume(self):
@@ -162,6 +231,17 @@ class Window:
         if self.scene:
             self.scene.handle_event(event)
 
+    @property
+    def scenes(self) -> SceneStack:
+        if not isinstance(self.scene, SceneStack):
+            raise TypeError("Window scene is not a scene stack")
+        return self.scene
+
+    def game_time(self) -> float:
+        """Tick-based time in seconds; pass as clock to particle systems and
+        emitter pools so they behave the same in recordings and replays"""
+        return self.tick / FPS
+
     def toggle_mute(self):
         self.muted = not self.muted
 
@@ -197,6 +277,8 @@ class Config:
     muted: bool = False
     log_enabled: bool = True
     volume: float = 1
+    record_input: bool = False
+    gc_debug: bool = False
 
     @classmethod
     def load(cls, filepath: PathLike) -> Config:
@@ -225,9 +307,28 @@ def load_icon(filepath: PathLike) -> None:
     pygame.display.set_icon(icon)
     set_taskbar_icon()
 
+image_cache = ImageCache(memory_budget=IMAGE_MEMORY_BUDGET)
+
+def load_image(
+    filepath: PathLike,
+    alpha: bool = True,
+    size: Optional[Tuple[int, int]] = None,
+    angle: float = 0,
+) -> Surface:
+    try:
+        return image_cache.load(filepath, alpha=alpha, size=size, angle=angle)
+    except Exception as exc:  # pylint: disable=broad-except
+        log_exception("Could not load image", exc)
+        return pygame.Surface(size or (1, 1))
+
+@no_error
+def init_mixer():
+    if not pygame.mixer.get_init():
+        pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=1024)
+
 @no_error
 def load_music(filepath: PathLike, volume: float):
-    pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=1024)
+    init_mixer()
     pygame.mixer.music.set_volume(volume)
     pygame.mixer.music.load(filepath)
     try:
@@ -235,6 +336,10 @@ def load_music(filepath: PathLike, volume: float):
     except Exception: # pylint: disable=broad-except
         pygame.mixer.music.play(loops=-1)  # fade_ms not recognized in pygame < 2
 
+@no_error
+def toggle_fullscreen():
+    pygame.display.toggle_fullscreen()  # not supported by every video driver, e.g. headless replays
+
 @no_error
 def disable_mouse():
     pygame.mouse.set_cursor(
@@ -340,7 +445,16 @@ def init_menu_scene(window: Window) -> Scene:
     load_music(filepath=MUSIC_FILEPATH, volume=window.volume)
     return MenuScene() # TODO: add implementation # type: ignore
 
-def init_window() -> Window:
+async def load_menu_scene(window: Window) -> Scene:
+    # preloadable counterpart of init_menu_scene, e.g. window.scenes.preload(load_menu_scene(window), REPLACE)
+    scene = MenuScene()
+    await yield_now()
+    init_mixer()
+    await yield_now()
+    load_music(filepath=MUSIC_FILEPATH, volume=window.volume)
+    return scene # type: ignore
+
+def init_window(seed: Optional[int] = None) -> Window:
     pygame.init()
     pygame.display.set_caption(GAME_TITLE)
     load_icon(filepath=ICON_FILEPATH)
@@ -352,11 +466,38 @@ def init_window() -> Window:
     screen = pygame.display.set_mode(tuple(SCREEN_SIZE), flags=flags)
     clock = pygame.time.Clock()
     window = Window(screen, clock, muted=config.muted, volume=config.volume, background_colour=BACKGROUND_COLOUR)
-    window.scene = init_menu_scene(window)
+
+    # recordings and replays need a fixed seed and timing independent background work
+    deterministic = seed is not None or config.record_input
+    if deterministic:
+        if seed is None:
+            seed = config.seed if config.seed is not None else random.randint(0, 100_000_000)
+        random.seed(seed)
+        logging.info("Deterministic seed: %s", seed)
+    if config.record_input and seed is not None:
+        window.recorder = InputRecorder(seed=seed)
+    scheduler = FrameScheduler(
+        frame_budget=1 / FPS,
+        reserve=SCHEDULER_RESERVE_TIME,
+        fixed_steps=DETERMINISTIC_BACKGROUND_STEPS if deterministic else None,
+    )
+    window.scheduler = scheduler
+    window.scene = SceneStack(scheduler)
+    window.scenes.push(init_menu_scene(window))
+
+    window.gc_policy = GcPolicy(frame_budget=1 / FPS, min_spare=GC_MIN_SPARE_TIME, debug=config.gc_debug)
+    window.gc_policy.freeze()  # assets are loaded, keep them out of future collections
+    window.gc_policy.start()
     return window
 
-def main_loop(window: Window):
-    for event in pygame.event.get():
+def main_loop(window: Window, events: Optional[List[Event]] = None):
+    if events is None:
+        events = pygame.event.get()
+    if window.recorder:
+        window.recorder.record(window.tick, events)
+        if window.tick and window.tick % RECORDING_SAVE_INTERVAL == 0:
+            save_recording(window)
+    for event in events:
         window.handle_event(event)
         if event.type == pygame.QUIT:
             window.running = False
@@ -366,28 +507,84 @@ def main_loop(window: Window):
             elif event.key == pygame.K_m:
                 window.toggle_mute()
             elif event.key == pygame.K_f:
-                pygame.display.toggle_fullscreen()
+                toggle_fullscreen()
     window.update()
 
+def main_frame(window: Window) -> bool:
+    main_loop(window)
+    return window.running
+
+@no_error
+def save_recording(window: Window) -> None:
+    if window.recorder:
+        window.recorder.recording.save(RECORDING_FILEPATH)
+
+def shutdown(window: Window) -> None:
+    save_recording(window)
+    if window.gc_policy:
+        window.gc_policy.stop()
+        logging.info("GC report: %s", GcReport.from_policy(window.gc_policy))
+    pygame.display.quit()
+
 def wasm_main():
     # pylint: disable=import-outside-toplevel
     import asyncio
     window = init_window()
-    async def runner():
-        while window.running:
-            main_loop(window)
-            await asyncio.sleep(0)
-    asyncio.run(runner())
-
+    try:
+        asyncio.run(window.scheduler.run_async(lambda: main_frame(window)))
+    finally:
+        shutdown(window)
+
+
+def replay(filepath: PathLike, headless: bool = True) -> ReplayResult:
+    """Feeds a recording back through the main loop as fast as possible,
+    returning the per-frame timings and the final state checksum"""
+    recording = Recording.load(filepath)
+    if headless:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+        os.environ["SDL_AUDIODRIVER"] = "dummy"
+    window = init_window(seed=recording.seed)
+    window.recorder = None
+    events = recording.events_by_tick()
+
+    frame_times: List[float] = []
+    while window.running and window.tick < recording.ticks:
+        start = time.perf_counter()
+        main_loop(window, events.get(window.tick, []))
+        frame_times.append(time.perf_counter() - start)
+
+    result = ReplayResult(frame_times, state_checksum(window.tick, window.scenes.top))
+    if window.gc_policy:
+        window.gc_policy.stop()
+    pygame.display.quit()
+    return result
+
+def replay_main(filepath: PathLike, headless: bool = True):
+    result = replay(filepath, headless)
+    result.save_trace(REPLAY_TRACE_FILEPATH)
+    logging.info(
+        "Replayed %s frames, mean %.3f ms, max %.3f ms, checksum %s",
+        len(result.frame_times),
+        result.mean_frame_time * 1000,
+        result.max_frame_time * 1000,
+        result.checksum,
+    )
+    print(result.checksum)
 
 def main():
     window = init_window()
-    while window.running:
-        main_loop(window)
-
-    pygame.display.quit()
+    try:
+        window.scheduler.run(lambda: main_frame(window))
+    finally:
+        shutdown(window)
 
 if __name__ == "__main__":
     # run normal main function when running as python script
     # run wasm async main function when calling with pygbag for web build
-    (main if __file__ == sys.argv[0] else wasm_main)()
+    # replay a recording with: python main.py --replay [filepath] [--windowed]
+    if "--replay" in sys.argv:
+        index = sys.argv.index("--replay") + 1
+        replay_filepath = sys.argv[index] if index < len(sys.argv) and not sys.argv[index].startswith("--") else RECORDING_FILEPATH
+        replay_main(replay_filepath, headless="--windowed" not in sys.argv)
+    else:
+        (main if __file__ == sys.argv[0] else wasm_main)()
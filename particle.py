@@ -5,11 +5,10 @@
 
 from __future__ import annotations
 
-import copy
 import random
 import time
 from dataclasses import dataclass, field
-from typing import Callable, List, Tuple, Type, Union
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type, Union
 
 import pygame
 
@@ -44,10 +43,72 @@ class DynamicColour:
     def colour(self) -> Tuple[int, int, int, int]:
         return (self.r, self.g, self.b, self.alpha)
 
+    def copy(self) -> DynamicColour:
+        return DynamicColour(self.r, self.g, self.b, self.alpha, self.max_, self.min_)
+
     def saturate(self, value: float) -> int:
         return max(min(round(value), self.max_), self.min_)
 
 
+RGBA = Tuple[int, int, int, int]
+
+
+def _lerp_colour(start: RGBA, end: RGBA, factor: float) -> RGBA:
+    return tuple(round(a + (b - a) * factor) for a, b in zip(start, end))  # type: ignore
+
+
+@dataclass(frozen=True)
+class ColourRamp:
+    """Precomputed RGBA lookup table, indexed by particle age in ticks"""
+
+    colours: Tuple[RGBA, ...]
+
+    def __post_init__(self):
+        if not self.colours:
+            raise ValueError("A colour ramp needs at least one colour")
+
+    def __len__(self) -> int:
+        return len(self.colours)
+
+    def __getitem__(self, age: int) -> RGBA:
+        colours = self.colours
+        return colours[age] if age < len(colours) else colours[-1]
+
+    @classmethod
+    def gradient(cls, stops: Sequence[Tuple[float, RGBA]], length: int) -> ColourRamp:
+        """Builds a ramp of the given length from (position, colour) stops, positions in [0, 1]"""
+        if not stops:
+            raise ValueError("A colour gradient needs at least one stop")
+        stops = sorted(stops, key=lambda stop: stop[0])
+        colours: List[RGBA] = []
+        index = 0
+        for age in range(length):
+            position = age / (length - 1) if length > 1 else 0
+            while index < len(stops) - 2 and position > stops[index + 1][0]:
+                index += 1
+            start_position, start = stops[index]
+            end_position, end = stops[min(index + 1, len(stops) - 1)]
+            span = end_position - start_position
+            factor = (position - start_position) / span if span > 0 else 0
+            colours.append(_lerp_colour(start, end, max(0.0, min(factor, 1.0))))
+        return cls(tuple(colours))
+
+    @classmethod
+    def from_drift(
+        cls, colour: DynamicColour, colour_drift: int = 0, alpha_drift: int = 0, length: int = 255
+    ) -> ColourRamp:
+        """Bakes the per-frame drift a particle would apply to a copy of colour"""
+        colour = colour.copy()
+        colours = [colour.colour]
+        for _ in range(length - 1):
+            colour += colour_drift
+            colour.alpha = colour.saturate(colour.alpha + alpha_drift)
+            colours.append(colour.colour)
+            if not any(colour.colour):
+                break
+        return cls(tuple(colours))
+
+
 def check_max_size_expired(particle: Particle) -> bool:
     return particle.size >= particle.max_size
 
@@ -71,11 +132,19 @@ class RectParticle:
     x_drift: int = 0
     y_drift: int = 0
     expiration_algorithm: Callable[[Particle], bool] = field(default=check_max_size_expired)
+    colour_ramp: Optional[ColourRamp] = None
 
     def __post_init__(self):
-        self.position.x += random.randint(-self.spread, self.spread)
-        self.position.y += random.randint(-self.spread, self.spread)
-        self.colour += random.randint(-self.colour_spread, self.colour_spread)
+        self.position = Coordinate(
+            self.position.x + random.randint(-self.spread, self.spread),
+            self.position.y + random.randint(-self.spread, self.spread),
+        )
+        self.age = 0
+        if self.colour_ramp is None:
+            self.colour += random.randint(-self.colour_spread, self.colour_spread)
+            self.rgba: RGBA = self.colour.colour
+        else:
+            self.rgba = self.colour_ramp[0]
         self.expired = False
 
     def update(self):
@@ -92,22 +161,27 @@ class RectParticle:
             return
 
         rect = pygame.Rect(*tuple(self.position), self.size, self.size)  # type: ignore
-        pygame.draw.rect(screen, self.colour.colour, rect, self.width)
+        pygame.draw.rect(screen, self.rgba, rect, self.width)
 
     def _update_size(self):
         self.size += self.size_drift
 
     def _update_colour(self):
+        self.age += 1
+        if self.colour_ramp is not None:
+            self.rgba = self.colour_ramp[self.age]
+            return
+
         self.colour += self.colour_drift
         self.colour.alpha = self.colour.saturate(self.colour.alpha + self.alpha_drift)
+        self.rgba = self.colour.colour
 
     def _update_position(self):
-        self.position.x += self.x_drift
-        self.position.y += self.y_drift
+        self.position = Coordinate(self.position.x + self.x_drift, self.position.y + self.y_drift)
 
     @property
     def expired(self):
-        return self._expired or self.size == 0 or not any(self.colour.colour)
+        return self._expired or self.size <= 0 or not any(self.rgba)
 
     @expired.setter
     def expired(self, value):
@@ -118,7 +192,7 @@ class CircleParticle(RectParticle):
     def render(self, screen: pygame.surface.Surface):
         if not self.expired:
             pygame.draw.circle(
-                screen, self.colour.colour, (int(self.position.x), int(self.position.y)), self.size, self.width
+                screen, self.rgba, (int(self.position.x), int(self.position.y)), self.size, self.width
             )
 
 
@@ -135,12 +209,13 @@ class ParticleSystem:
     colour_drift: int = 0
     lifetime: float = 1
     expired: bool = False
+    clock: Callable[[], float] = field(default=time.time, repr=False)
 
     def __post_init__(self):
         self.particles: List[Particle] = []
-        self.start_time = time.time()
-        self.spawn_time = time.time()
-        self.kwargs = {}
+        self.start_time = self.clock()
+        self.spawn_time = self.start_time
+        self.kwargs: Dict[str, Any] = {}
 
     def add_kwargs(self, **kwargs):
         self.kwargs.update(kwargs)
@@ -153,13 +228,45 @@ class ParticleSystem:
             particle.render(screen)
 
     def clone(self, position: Coordinate) -> ParticleSystem:
-        copied = copy.deepcopy(self)
-        copied.position = position.clone()
-        copied.__post_init__()
-        copied.expired = False
-        copied.kwargs = self.kwargs
+        copied = ParticleSystem(
+            self.particle_type,
+            position,
+            self.spawn_rate,
+            self.colour.copy(),
+            colour_drift=self.colour_drift,
+            lifetime=self.lifetime,
+            clock=self.clock,
+        )
+        copied.add_kwargs(**self.kwargs)
         return copied
 
+    def restart(self, position: Coordinate, colour: DynamicColour) -> None:
+        """Resets a finished system in place so that it can be reused at a new position"""
+        self.position = position
+        self.colour = colour
+        self.particles.clear()
+        self.start_time = self.clock()
+        self.spawn_time = self.start_time
+        self.expired = False
+
+    def burst(self, count: int) -> None:
+        """Emits count particles in one call, independent of the spawn rate.
+
+        Particles are still constructed one by one (there is no array backend),
+        but the per-particle attribute lookups and expiry checks of
+        create_new_particle are hoisted out of the loop.
+        """
+        particle_type = self.particle_type
+        position = self.position
+        colour = self.colour
+        kwargs = self.kwargs
+        new_particles = [
+            particle_type(position, colour.copy(), **kwargs) for _ in range(count)
+        ]
+        if any(particle.expired for particle in new_particles):
+            self.expired = True
+        self.particles.extend(new_particles)
+
     def update(self):
         if self.fully_expired:
             return
@@ -168,16 +275,17 @@ class ParticleSystem:
         for particle in self.particles:
             particle.update()
 
-        if time.time() - self.start_time > self.lifetime:
+        now = self.clock()
+        if now - self.start_time > self.lifetime:
             self.expired = True
 
-        if time.time() - self.spawn_time > self.spawn_rate and not self.expired:
-            self.spawn_time = time.time()
+        if now - self.spawn_time > self.spawn_rate and not self.expired:
+            self.spawn_time = now
             self.particles.append(self.create_new_particle())
 
     def create_new_particle(self) -> Particle:
         new_particle = self.particle_type(
-            self.position.clone(), copy.deepcopy(self.colour), **self.kwargs
+            self.position, self.colour.copy(), **self.kwargs
         )
         if new_particle.expired:
             self.expired = True
@@ -186,3 +294,98 @@ class ParticleSystem:
     @property
     def fully_expired(self) -> bool:
         return self.expired and all(x.expired for x in self.particles)
+
+
+@dataclass(frozen=True, eq=False)
+class EmitterDefinition:
+    """Immutable particle system prototype, instantiated at a position without copying.
+
+    Definitions compare and hash by identity, so create them once (e.g. as module
+    constants) and reuse them; EmitterPool recycles systems per definition object.
+    """
+
+    particle_type: Type[Particle]
+    spawn_rate: float
+    colour: Tuple[int, int, int, int]
+    colour_drift: int = 0
+    lifetime: float = 1
+    burst: int = 0
+    kwargs: Tuple[Tuple[str, Any], ...] = ()
+
+    def with_kwargs(self, **kwargs) -> EmitterDefinition:
+        merged = {**dict(self.kwargs), **kwargs}
+        return EmitterDefinition(
+            self.particle_type,
+            self.spawn_rate,
+            self.colour,
+            colour_drift=self.colour_drift,
+            lifetime=self.lifetime,
+            burst=self.burst,
+            kwargs=tuple(merged.items()),
+        )
+
+    def create_colour(self) -> DynamicColour:
+        return DynamicColour(*self.colour)
+
+    def instantiate(
+        self, position: Coordinate, clock: Callable[[], float] = time.time
+    ) -> ParticleSystem:
+        system = ParticleSystem(
+            self.particle_type,
+            position,
+            self.spawn_rate,
+            self.create_colour(),
+            colour_drift=self.colour_drift,
+            lifetime=self.lifetime,
+            clock=clock,
+        )
+        system.add_kwargs(**dict(self.kwargs))
+        if self.burst:
+            system.burst(self.burst)
+        return system
+
+    def reuse(self, system: ParticleSystem, position: Coordinate) -> ParticleSystem:
+        system.restart(position, self.create_colour())
+        if self.burst:
+            system.burst(self.burst)
+        return system
+
+
+@dataclass
+class EmitterPool:
+    """Owns active particle systems and recycles fully expired ones per definition"""
+
+    max_free: int = 64
+    clock: Callable[[], float] = field(default=time.time, repr=False)
+
+    def __post_init__(self):
+        self.active: List[Tuple[EmitterDefinition, ParticleSystem]] = []
+        self._free: Dict[EmitterDefinition, List[ParticleSystem]] = {}
+
+    def emit(self, definition: EmitterDefinition, position: Coordinate) -> ParticleSystem:
+        free = self._free.get(definition)
+        if free:
+            system = definition.reuse(free.pop(), position)
+        else:
+            system = definition.instantiate(position, self.clock)
+        self.active.append((definition, system))
+        return system
+
+    def update(self):
+        still_active = []
+        for definition, system in self.active:
+            system.update()
+            if system.fully_expired:
+                self._release(definition, system)
+            else:
+                still_active.append((definition, system))
+        self.active = still_active
+
+    def render(self, screen: pygame.surface.Surface):
+        for _, system in self.active:
+            system.render(screen)
+
+    def _release(self, definition: EmitterDefinition, system: ParticleSystem) -> None:
+        free = self._free.setdefault(definition, [])
+        if len(free) < self.max_free:
+            free.append(system)
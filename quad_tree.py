@@ -7,6 +7,8 @@ import pygame
 
 from coordinate import Coordinate as Point
 
+MIN_QUAD_SIZE = 1  # stops subdividing, e.g. when many entities share a position
+
 
 class Positioned(Protocol):
     position: Point
@@ -24,14 +26,19 @@ class Rect:
         yield from self.position + self.size
 
     def contains(self, point: Point) -> bool:
-        bottom = self.position + self.size
+        position, size = self.position, self.size
         return (
-            self.position.x <= point.x < bottom.x
-            and self.position.y <= point.y < bottom.y
+            position.x <= point.x < position.x + size.x
+            and position.y <= point.y < position.y + size.y
         )
 
     def intersects(self, rect: Rect) -> bool:
-        return self.contains(rect.position) or rect.contains(self.position)
+        return (
+            self.position.x < rect.position.x + rect.size.x
+            and rect.position.x < self.position.x + self.size.x
+            and self.position.y < rect.position.y + rect.size.y
+            and rect.position.y < self.position.y + self.size.y
+        )
 
 
 class QuadTree:
@@ -56,7 +63,7 @@ class QuadTree:
         if not self.boundary.contains(entity.position):
             return False
 
-        if len(self.entities) < self.max_points:
+        if len(self.entities) < self.max_points or self.boundary.size.x <= MIN_QUAD_SIZE:
             self.entities.append(entity)
             return True
 
@@ -69,13 +76,19 @@ class QuadTree:
 
         return False
 
-    def remove(self, entity: Positioned) -> Positioned | None:
-        if entity in self.entities:
-            self.entities.remove(entity)
-            return entity
+    def remove(
+        self, entity: Positioned, position: Optional[Point] = None
+    ) -> Positioned | None:
+        """Removes the entity (by identity), only searching quads containing position if specified"""
+        for index, existing in enumerate(self.entities):
+            if existing is entity:
+                del self.entities[index]
+                return entity
 
         for quad in self.sub_quads:
-            removed = quad.remove(entity)
+            if position is not None and not quad.boundary.contains(position):
+                continue
+            removed = quad.remove(entity, position)
             if removed:
                 return removed
 
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""Deterministic input recording and replay for performance regression runs
+
+Replays are only deterministic if gameplay does not depend on wall-clock time:
+particle systems and emitter pools must be given clock=window.game_time, and
+the scheduler runs a fixed number of background steps per frame while
+recording or replaying.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import random
+import statistics
+import zlib
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Tuple, Union
+
+import pygame
+
+Event = pygame.event.Event
+PathLike = Union[os.PathLike, str]
+RecordedEvent = Tuple[int, int, Dict[str, Any]]
+
+_PLAIN_TYPES = (int, float, str, bool, tuple, type(None))
+
+
+@dataclass
+class Recording:
+    """Seed plus tick-stamped (tick, event type, event attributes) entries"""
+
+    seed: int
+    events: List[RecordedEvent] = field(default_factory=list)
+    ticks: int = 0
+
+    def events_by_tick(self) -> Dict[int, List[Event]]:
+        events: Dict[int, List[Event]] = defaultdict(list)
+        for tick, type_, attributes in self.events:
+            events[tick].append(pygame.event.Event(type_, attributes))
+        return events
+
+    def save(self, filepath: PathLike) -> None:
+        data = pickle.dumps(self.__dict__, protocol=pickle.HIGHEST_PROTOCOL)
+        with open(filepath, "wb") as file:
+            file.write(zlib.compress(data))
+
+    @classmethod
+    def load(cls, filepath: PathLike) -> Recording:
+        with open(filepath, "rb") as file:
+            dict_: Dict[str, Any] = pickle.loads(zlib.decompress(file.read()))
+        return cls(**dict_)
+
+
+@dataclass
+class InputRecorder:
+    seed: int
+
+    def __post_init__(self):
+        self.recording = Recording(seed=self.seed)
+
+    def record(self, tick: int, events: Iterable[Event]) -> None:
+        for event in events:
+            attributes = {
+                key: value
+                for key, value in event.dict.items()
+                if isinstance(value, _PLAIN_TYPES)
+            }
+            self.recording.events.append((tick, event.type, attributes))
+        self.recording.ticks = tick + 1
+
+
+@dataclass
+class ReplayResult:
+    frame_times: List[float]
+    checksum: str
+
+    @property
+    def mean_frame_time(self) -> float:
+        return statistics.fmean(self.frame_times) if self.frame_times else 0
+
+    @property
+    def max_frame_time(self) -> float:
+        return max(self.frame_times, default=0)
+
+    def save_trace(self, filepath: PathLike) -> None:
+        with open(filepath, "w", encoding="utf-8") as file:
+            file.write("tick,frame_time_ms\n")
+            for tick, frame_time in enumerate(self.frame_times):
+                file.write(f"{tick},{frame_time * 1000:.4f}\n")
+            file.write(f"# checksum,{self.checksum}\n")
+
+
+def state_checksum(tick: int, scene: Any) -> str:
+    """Hashes the RNG state, the tick and scene.checksum() if the scene provides one"""
+    digest = hashlib.sha256()
+    digest.update(repr(random.getstate()).encode())
+    digest.update(str(tick).encode())
+    checksum = getattr(scene, "checksum", None)
+    if callable(checksum):
+        digest.update(str(checksum()).encode())
+    return digest.hexdigest()
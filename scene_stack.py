@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""Scene stack with suspended scenes and background scene preloading"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Coroutine, List, Optional, Protocol
+
+import pygame
+
+from scheduler import FrameScheduler, Task
+
+PUSH = "push"
+REPLACE = "replace"
+
+
+class StackedScene(Protocol):
+    def update(self) -> None:
+        ...
+
+    def render(self, screen: pygame.surface.Surface) -> None:
+        ...
+
+    def handle_event(self, event: pygame.event.Event) -> None:
+        ...
+
+
+@dataclass
+class _PendingScene:
+    task: Task
+    transition: str
+
+
+class SceneStack:
+    """Only the top scene is updated, rendered and receives events; scenes below
+    it are suspended and keep their state until they are on top again.
+
+    Scenes may define optional hooks: enter() when they are pushed or swapped
+    in, suspend() when another scene is pushed on top of them, resume() when
+    they are on top again, and exit() when they are popped or replaced, e.g. to
+    seed the RNG or to pause or stop music.
+    """
+
+    def __init__(self, scheduler: FrameScheduler):
+        self.scheduler = scheduler
+        self.scenes: List[StackedScene] = []
+        self._pending: List[_PendingScene] = []
+
+    def __len__(self) -> int:
+        return len(self.scenes)
+
+    @property
+    def top(self) -> Optional[StackedScene]:
+        return self.scenes[-1] if self.scenes else None
+
+    @property
+    def loading(self) -> bool:
+        return bool(self._pending)
+
+    def push(self, scene: StackedScene) -> None:
+        _call_hook(self.top, "suspend")
+        self.scenes.append(scene)
+        _call_hook(scene, "enter")
+
+    def pop(self) -> Optional[StackedScene]:
+        if not self.scenes:
+            return None
+        scene = self.scenes.pop()
+        _call_hook(scene, "exit")
+        _call_hook(self.top, "resume")
+        return scene
+
+    def replace(self, scene: StackedScene) -> Optional[StackedScene]:
+        previous = self.scenes.pop() if self.scenes else None
+        _call_hook(previous, "exit")
+        self.scenes.append(scene)
+        _call_hook(scene, "enter")
+        return previous
+
+    def preload(
+        self, loader: Coroutine[Any, Any, StackedScene], transition: str = PUSH
+    ) -> Task:
+        """Builds a scene with the async loader in the frames' spare time, then
+        pushes it or replaces the top scene with it on the next frame boundary"""
+        if transition not in (PUSH, REPLACE):
+            raise ValueError(f"Unknown scene transition {transition}")
+        task = self.scheduler.spawn(loader)
+        self._pending.append(_PendingScene(task, transition))
+        return task
+
+    def update(self) -> None:
+        self._apply_loaded()
+        if self.top:
+            self.top.update()
+
+    def render(self, screen: pygame.surface.Surface) -> None:
+        if self.top:
+            self.top.render(screen)
+
+    def handle_event(self, event: pygame.event.Event) -> None:
+        if self.top:
+            self.top.handle_event(event)
+
+    def _apply_loaded(self) -> None:
+        while self._pending and self._pending[0].task.done:
+            pending = self._pending.pop(0)
+            if pending.task.error is not None or pending.task.result is None:
+                continue
+            if pending.transition == PUSH:
+                self.push(pending.task.result)
+            else:
+                self.replace(pending.task.result)
+
+
+def _call_hook(scene: Optional[StackedScene], name: str) -> None:
+    hook = getattr(scene, name, None)
+    if callable(hook):
+        hook()
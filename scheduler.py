@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""Frame-budgeted cooperative scheduler for background coroutines"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Coroutine, Deque, Generator, List, Optional, Tuple
+
+from error import log_exception
+
+
+@dataclass
+class _Suspend:
+    """Awaitable handing control back to the scheduler"""
+
+    frames: int = 0
+
+    def __await__(self) -> Generator[_Suspend, None, None]:
+        yield self
+
+
+def yield_now() -> _Suspend:
+    """Lets other work run; resumes in the same frame if budget is left"""
+    return _Suspend(frames=0)
+
+
+def next_frame() -> _Suspend:
+    """Resumes at the start of the next frame's background slot"""
+    return _Suspend(frames=1)
+
+
+def wait_frames(frames: int) -> _Suspend:
+    return _Suspend(frames=max(frames, 0))
+
+
+@dataclass
+class Task:
+    coroutine: Coroutine[Any, Any, Any]
+    name: str = ""
+    wake_frame: int = 0
+    done: bool = False
+    result: Any = None
+    error: Optional[BaseException] = None
+
+    def cancel(self) -> None:
+        if not self.done:
+            self.coroutine.close()
+            self.done = True
+
+
+class FrameScheduler:
+    """Runs background coroutines in the time left over after each frame's work.
+
+    Coroutines are plain async def functions that only await yield_now(),
+    next_frame() or wait_frames(); the scheduler steps them until the frame
+    deadline (frame start + frame_budget - reserve) and resumes them next frame.
+
+    With fixed_steps set, each frame instead runs exactly that many coroutine
+    steps regardless of timing, so that background work is deterministic while
+    input is recorded or replayed.
+    """
+
+    def __init__(self, frame_budget: float, reserve: float = 0.002, fixed_steps: Optional[int] = None):
+        self.frame_budget = frame_budget
+        self.reserve = reserve
+        self.fixed_steps = fixed_steps
+        self.frame = 0
+        self.tasks: List[Task] = []
+        self._ready: Deque[Task] = deque()
+
+    def spawn(self, coroutine: Coroutine[Any, Any, Any], name: str = "") -> Task:
+        task = Task(coroutine, name=name or coroutine.__qualname__, wake_frame=self.frame)
+        self.tasks.append(task)
+        self._ready.append(task)
+        return task
+
+    @property
+    def idle(self) -> bool:
+        return not self.tasks
+
+    def run_background(self, frame_start: float) -> None:
+        """Steps ready coroutines until the deadline of the frame started at frame_start"""
+        deadline = frame_start + self.frame_budget - self.reserve
+        fixed_steps = self.fixed_steps
+        ready = self._ready
+        steps = 0
+        while ready and (
+            time.perf_counter() < deadline if fixed_steps is None else steps < fixed_steps
+        ):
+            steps += 1
+            task = ready.popleft()
+            if task.done:
+                continue
+            if self._step(task) and task.wake_frame <= self.frame:
+                ready.append(task)
+        self._next_frame()
+
+    def run(self, step: Callable[[], bool]) -> None:
+        """Desktop driver: calls step once per frame until it returns False,
+        sleeping until the next frame deadline in between"""
+        deadline = time.perf_counter()
+        while True:
+            deadline += self.frame_budget
+            if not step():
+                return
+            remaining, deadline = self._pace(deadline)
+            if remaining > 0:
+                time.sleep(remaining)
+
+    async def run_async(self, step: Callable[[], bool]) -> None:
+        """Browser driver: like run, but awaits the frame deadline so that the
+        browser event loop runs instead of blocking the tab"""
+        deadline = time.perf_counter()
+        while True:
+            deadline += self.frame_budget
+            if not step():
+                return
+            remaining, deadline = self._pace(deadline)
+            await asyncio.sleep(max(remaining, 0))
+
+    @staticmethod
+    def _pace(deadline: float) -> Tuple[float, float]:
+        """Returns the time left until deadline; when running behind, the
+        deadline restarts from now instead of rushing frames to catch up"""
+        now = time.perf_counter()
+        if deadline < now:
+            return 0, now
+        return deadline - now, deadline
+
+    def _step(self, task: Task) -> bool:
+        try:
+            suspend = task.coroutine.send(None)
+        except StopIteration as stop:
+            task.done = True
+            task.result = stop.value
+            return False
+        except Exception as exc:  # pylint: disable=broad-except
+            log_exception(f"Background task {task.name} failed", exc)
+            task.done = True
+            task.error = exc
+            return False
+
+        frames = suspend.frames if isinstance(suspend, _Suspend) else 0
+        task.wake_frame = self.frame + frames
+        return True
+
+    def _next_frame(self) -> None:
+        self.frame += 1
+        self.tasks = [task for task in self.tasks if not task.done]
+        queued = set(map(id, self._ready))
+        for task in self.tasks:
+            if task.wake_frame <= self.frame and id(task) not in queued:
+                self._ready.append(task)
@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+"""Utilities for pygame surfaces"""
+
+import pygame
+
+
+def surface_bytes(surface: pygame.surface.Surface) -> int:
+    width, height = surface.get_size()
+    return width * height * surface.get_bytesize()
@@ -0,0 +1,68 @@
+# pylint: disable=missing-docstring
+
+from dataclasses import dataclass, field
+
+from camera import Camera, EntityCuller
+from coordinate import Coordinate
+from quad_tree import Rect
+
+
+@dataclass
+class DummyEntity:
+    position: Coordinate
+    updates: list = field(default_factory=list)
+
+    def update(self, game, ticks) -> None:
+        self.updates.append((game.tick, ticks))
+
+    def render(self, screen, camera) -> None:
+        ...
+
+
+@dataclass
+class DummyGame:
+    tick: int
+
+
+def test_moving_onto_equal_entity_keeps_both_visible():
+    culler = EntityCuller(Rect(Coordinate(), Coordinate(100, 100)))
+    first = DummyEntity(Coordinate(5, 5))
+    second = DummyEntity(Coordinate(10, 10))
+    culler.add(first)
+    culler.add(second)
+
+    second.position = Coordinate(5, 5)  # now compares equal to first
+    culler.update(game=DummyGame(tick=0), camera=Camera(Coordinate(100, 100)))
+
+    visible = culler.find_visible(Camera(Coordinate(100, 100)))
+    assert sorted(map(id, visible)) == sorted([id(first), id(second)])
+
+
+def test_only_entities_in_view_are_visible():
+    culler = EntityCuller(Rect(Coordinate(), Coordinate(4000, 4000)))
+    near = DummyEntity(Coordinate(2000, 2000))
+    far = DummyEntity(Coordinate(100, 100))
+    culler.add(near)
+    culler.add(far)
+
+    camera = Camera(Coordinate(800, 600))
+    camera.centre_on(Coordinate(2000, 2000))
+    assert [id(x) for x in culler.find_visible(camera)] == [id(near)]
+    assert camera.world_to_screen(near.position) == Coordinate(400, 300)
+
+
+def test_distant_entities_receive_elapsed_ticks():
+    culler = EntityCuller(Rect(Coordinate(), Coordinate(4000, 4000)), distant_update_interval=10)
+    near = DummyEntity(Coordinate(10, 10))
+    far = DummyEntity(Coordinate(3000, 3000))
+    culler.add(near)
+    culler.add(far)
+
+    camera = Camera(Coordinate(800, 600))
+    for tick in range(30):
+        culler.update(DummyGame(tick), camera)
+
+    assert [ticks for _, ticks in near.updates] == [1] * 30
+    far_ticks = [tick for tick, _ in far.updates]
+    assert len(far_ticks) == 3
+    assert [ticks for _, ticks in far.updates][1:] == [10, 10]
@@ -0,0 +1,74 @@
+# pylint: disable=missing-docstring
+
+import itertools
+import random
+
+import pytest
+
+from collision import find_contacts, sweep
+from coordinate import Coordinate
+
+
+def brute_force_pairs(boxes, velocities):
+    return {
+        (first, second)
+        for first, second in itertools.combinations(range(len(boxes)), 2)
+        if sweep(boxes[first], velocities[first], boxes[second], velocities[second])
+    }
+
+
+def random_scene(seed: int, count: int):
+    rng = random.Random(seed)
+    boxes = [
+        (rng.uniform(0, 1000), rng.uniform(0, 1000), rng.uniform(2, 20), rng.uniform(2, 20))
+        for _ in range(count)
+    ]
+    velocities = [(rng.uniform(-30, 30), rng.uniform(-30, 30)) for _ in range(count)]
+    return boxes, velocities
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_find_contacts_matches_brute_force(seed):
+    boxes, velocities = random_scene(seed, 400)
+    contacts = find_contacts(boxes, velocities)
+    assert {(x.first, x.second) for x in contacts} == brute_force_pairs(boxes, velocities)
+    assert [x.time for x in contacts] == sorted(x.time for x in contacts)
+
+
+def test_find_contacts_matches_brute_force_with_oversized_boxes():
+    boxes, velocities = random_scene(4, 300)
+    boxes += [(-100, 500, 5000, 4), (500, -100, 4, 5000)]  # long walls
+    velocities += [(0, 0), (0, 0)]
+    boxes.append((0, 0, 2, 2))  # very fast projectile
+    velocities.append((900, 900))
+    contacts = find_contacts(boxes, velocities)
+    assert {(x.first, x.second) for x in contacts} == brute_force_pairs(boxes, velocities)
+
+
+def test_fast_projectile_does_not_tunnel_through_thin_wall():
+    contacts = find_contacts([(0, 0, 2, 2), (50, -10, 1, 30)], [(100, 0), (0, 0)])
+    assert len(contacts) == 1
+    assert contacts[0].time == pytest.approx(0.48)
+    assert contacts[0].normal == Coordinate(-1, 0)
+
+
+def test_overlapping_boxes_collide_at_time_zero():
+    contacts = find_contacts([(0, 0, 10, 10), (5, 1, 10, 10)])
+    assert len(contacts) == 1
+    assert contacts[0].time == 0
+    assert contacts[0].normal == Coordinate(-1, 0)
+
+
+def test_crossing_overlap_without_contained_corner():
+    contacts = find_contacts([(0, 10, 100, 5), (40, 0, 5, 100)])
+    assert [(x.first, x.second) for x in contacts] == [(0, 1)]
+
+
+def test_separating_and_touching_boxes_do_not_collide():
+    assert sweep((0, 0, 10, 10), (-5, 0), (10, 0, 10, 10), (0, 0)) is None
+    assert sweep((0, 0, 10, 10), (0, 0), (10, 0, 10, 10), (0, 0)) is None
+    assert sweep((0, 0, 10, 10), (5, 0), (20, 0, 10, 10), (0, 0)) is None
+
+
+def test_stacked_boxes_do_not_recurse_forever():
+    assert len(find_contacts([(5, 5, 1, 1)] * 50)) == 50 * 49 // 2
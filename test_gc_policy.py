@@ -0,0 +1,85 @@
+# pylint: disable=missing-docstring
+
+import gc
+
+import pytest
+
+from gc_policy import GcPolicy, GcReport
+
+FRAME_BUDGET = 0.02
+
+
+@pytest.fixture(name="make_policy")
+def fixture_make_policy():
+    thresholds = gc.get_threshold()
+    policies = []
+
+    def make_policy(**kwargs) -> GcPolicy:
+        gc.collect()
+        gc.set_threshold(1000, 10, 10)
+        policy = GcPolicy(frame_budget=FRAME_BUDGET, **kwargs)
+        policies.append(policy)
+        return policy
+
+    yield make_policy
+    for policy in policies:
+        policy.stop()
+    gc.set_threshold(*thresholds)
+
+
+def make_garbage(count: int) -> None:
+    for _ in range(count):
+        cycle: list = []
+        cycle.append(cycle)
+
+
+def test_start_disables_and_stop_restores_gc(make_policy):
+    policy = make_policy()
+    policy.start()
+    assert not gc.isenabled()
+    assert policy._on_gc in gc.callbacks  # pylint: disable=protected-access
+
+    policy.stop()
+    assert gc.isenabled()
+    assert policy._on_gc not in gc.callbacks  # pylint: disable=protected-access
+
+
+def test_collects_only_when_due_and_with_spare_time(make_policy):
+    policy = make_policy(min_spare=0.004)
+    policy.start()
+    policy.end_frame(frame_time=0)
+    assert not policy.pauses  # nothing has reached its threshold
+
+    make_garbage(1500)
+    policy.end_frame(frame_time=FRAME_BUDGET)
+    assert not policy.pauses  # no spare time
+
+    policy.end_frame(frame_time=0)
+    assert [pause.generation for pause in policy.pauses] == [0]
+    assert policy.pauses[0].collected >= 1500
+    assert policy.pauses[0].tick == 2
+
+
+def test_young_generation_is_collected_after_max_deferral(make_policy):
+    policy = make_policy(max_deferral=3)
+    policy.start()
+    make_garbage(1500)
+    policy.end_frame(frame_time=FRAME_BUDGET)
+    assert not policy.pauses
+
+    make_garbage(2000)
+    policy.end_frame(frame_time=FRAME_BUDGET)
+    assert [pause.generation for pause in policy.pauses] == [0]
+
+
+def test_debug_mode_tracks_retained_allocations(make_policy):
+    policy = make_policy(debug=True)
+    policy.start()
+    policy.end_frame(frame_time=FRAME_BUDGET)
+    retained = [[index] for index in range(500)]
+    policy.end_frame(frame_time=FRAME_BUDGET)
+
+    assert len(policy.allocations) == 1
+    assert policy.allocations[0].retained_blocks >= len(retained)
+    assert "test_gc_policy.py" in policy.allocations[0].by_subsystem
+    assert GcReport.from_policy(policy).mean_retained_blocks >= len(retained)
@@ -0,0 +1,77 @@
+# pylint: disable=missing-docstring
+
+import pygame
+import pytest
+
+from image_cache import ImageCache
+
+
+@pytest.fixture(name="image_path")
+def fixture_image_path(tmp_path):
+    path = tmp_path / "sprite.png"
+    surface = pygame.Surface((8, 8))
+    surface.fill((10, 20, 30))
+    pygame.image.save(surface, str(path))
+    return path
+
+
+def test_repeated_loads_are_deduplicated(image_path):
+    cache = ImageCache()
+    first = cache.load(image_path)
+    assert cache.load(str(image_path)) is first
+    assert cache.load(image_path, alpha=False) is not first
+    assert (cache.stats.hits, cache.stats.misses) == (1, 2)
+
+
+def test_variants_count_only_the_requested_image(image_path):
+    cache = ImageCache()
+    rotated = cache.load(image_path, size=(16, 16), angle=90)
+    assert rotated.get_size() == (16, 16)
+    assert (cache.stats.hits, cache.stats.misses) == (0, 1)
+    assert len(cache) == 3  # base, scaled and rotated variants
+
+    cache.load(image_path, size=(16, 16))
+    assert cache.stats.hit_rate == 0.5
+
+
+def test_least_recently_used_entries_are_evicted(image_path):
+    cache = ImageCache(memory_budget=16 * 16 * 3 + 12 * 12 * 3)
+    cache.load(image_path, alpha=False, size=(16, 16))  # also caches the 8x8 base image
+    cache.load(image_path, alpha=False, size=(12, 12))
+
+    assert cache.resident_bytes <= cache.memory_budget
+    assert cache.stats.evictions == 1
+    # building the 12x12 variant touched the base image, so 16x16 was least recently used
+    misses = cache.stats.misses
+    cache.load(image_path, alpha=False, size=(12, 12))
+    assert cache.stats.misses == misses
+    cache.load(image_path, alpha=False, size=(16, 16))
+    assert cache.stats.misses == misses + 1
+
+
+def test_conversion_after_display_init_respects_budget(image_path):
+    cache = ImageCache(memory_budget=16 * 16 * 4 + 100)
+    cache.load(image_path, alpha=False)
+    cache.load(image_path, alpha=False, size=(16, 16))
+    assert cache.resident_bytes == 8 * 8 * 3 + 16 * 16 * 3
+
+    pygame.display.set_mode((1, 1), depth=32)
+    try:
+        converted = cache.load(image_path, alpha=False, size=(16, 16))
+    finally:
+        pygame.display.quit()
+
+    assert converted.get_bytesize() == 4
+    assert cache.resident_bytes <= cache.memory_budget
+    assert cache.stats.evictions == 1
+
+
+def test_palettized_images_can_be_scaled(tmp_path):
+    path = tmp_path / "palettized.png"
+    surface = pygame.Surface((8, 8), depth=8)
+    surface.fill((10, 20, 30))
+    pygame.image.save(surface, str(path))
+
+    scaled = ImageCache().load(path, size=(16, 16))
+    assert scaled.get_size() == (16, 16)
+    assert scaled.get_at((15, 15)) == surface.get_at((0, 0))  # nearest palette colour
@@ -0,0 +1,120 @@
+# pylint: disable=missing-docstring
+
+import pytest
+
+from coordinate import Coordinate
+from particle import ColourRamp, DynamicColour, EmitterDefinition, EmitterPool, ParticleSystem, RectParticle
+
+
+def test_gradient_hits_stops_and_interpolates():
+    ramp = ColourRamp.gradient(
+        [(0, (255, 255, 0, 255)), (0.5, (255, 0, 0, 200)), (1, (0, 0, 0, 0))], length=11
+    )
+    assert len(ramp) == 11
+    assert ramp[0] == (255, 255, 0, 255)
+    assert ramp[5] == (255, 0, 0, 200)
+    assert ramp[10] == (0, 0, 0, 0)
+    assert ramp[2] == (255, 153, 0, 233)
+
+
+def test_gradient_sorts_stops():
+    ramp = ColourRamp.gradient([(1, (0, 0, 0, 0)), (0, (100, 100, 100, 100))], length=3)
+    assert ramp.colours == ((100, 100, 100, 100), (50, 50, 50, 50), (0, 0, 0, 0))
+
+
+def test_single_stop_gradient_is_constant():
+    ramp = ColourRamp.gradient([(0.3, (1, 2, 3, 4))], length=4)
+    assert set(ramp.colours) == {(1, 2, 3, 4)}
+
+
+def test_ramp_clamps_to_last_colour():
+    ramp = ColourRamp(((1, 1, 1, 1), (2, 2, 2, 2)))
+    assert ramp[5] == (2, 2, 2, 2)
+
+
+def test_empty_ramp_is_rejected():
+    with pytest.raises(ValueError):
+        ColourRamp(())
+    with pytest.raises(ValueError):
+        ColourRamp.gradient([], length=5)
+
+
+def test_from_drift_matches_dynamic_colour():
+    start = DynamicColour(100, 50, 20, 255)
+    ramp = ColourRamp.from_drift(start, colour_drift=-10, alpha_drift=-30)
+
+    colour = start.copy()
+    for age in range(1, len(ramp)):
+        colour += -10
+        colour.alpha = colour.saturate(colour.alpha - 30)
+        assert ramp[age] == colour.colour
+    assert ramp[len(ramp)] == (0, 0, 0, 0)
+    assert start.colour == (100, 50, 20, 255)
+
+
+class TickClock:
+    def __init__(self):
+        self.tick = 0
+
+    def __call__(self) -> float:
+        return self.tick / 50
+
+
+def make_system(**kwargs) -> ParticleSystem:
+    system = ParticleSystem(RectParticle, Coordinate(10, 10), 0.1, DynamicColour(200, 100, 50, 255), **kwargs)
+    system.add_kwargs(size=5)
+    return system
+
+
+def test_burst_adds_particles():
+    system = make_system()
+    system.burst(30)
+    system.burst(0)
+    assert len(system.particles) == 30
+    assert len({id(particle.colour) for particle in system.particles}) == 30
+    assert not system.expired
+
+
+def test_clone_copies_without_sharing_state():
+    system = make_system()
+    system.burst(3)
+    clone = system.clone(Coordinate(50, 50))
+
+    assert clone.position == Coordinate(50, 50)
+    assert clone.particles == [] and clone.particles is not system.particles
+    assert clone.colour == system.colour and clone.colour is not system.colour
+    clone.colour += 10
+    clone.add_kwargs(size=9)
+    assert system.colour.r == 200
+    assert system.kwargs == {"size": 5}
+
+
+def run_until_released(pool: EmitterPool, clock: TickClock) -> None:
+    for _ in range(100):
+        clock.tick += 1
+        pool.update()
+    assert not pool.active  # particles shrinking past size 0 must count as expired
+
+
+def test_pool_reuses_expired_systems_per_definition_object():
+    clock = TickClock()
+    pool = EmitterPool(clock=clock)
+    definition = EmitterDefinition(RectParticle, 0.02, (200, 100, 50, 255), lifetime=0.1).with_kwargs(size=3)
+    first = pool.emit(definition, Coordinate(10, 10))
+    run_until_released(pool, clock)
+
+    assert pool.emit(definition.with_kwargs(), Coordinate(20, 20)) is not first  # equal, but another object
+    second = pool.emit(definition, Coordinate(30, 30))
+    assert second is first
+    assert second.position == Coordinate(30, 30) and not second.expired and not second.particles
+
+
+def test_pool_caps_free_systems():
+    clock = TickClock()
+    pool = EmitterPool(max_free=2, clock=clock)
+    definition = EmitterDefinition(RectParticle, 0.02, (200, 100, 50, 255), lifetime=0.1).with_kwargs(size=3)
+    systems = [pool.emit(definition, Coordinate(10, 10)) for _ in range(5)]
+    run_until_released(pool, clock)
+
+    reused = [pool.emit(definition, Coordinate(10, 10)) for _ in range(3)]
+    assert sum(any(x is y for y in systems) for x in reused) == 2
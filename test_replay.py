@@ -0,0 +1,80 @@
+# pylint: disable=missing-docstring
+
+import random
+from types import SimpleNamespace
+
+import pygame
+
+from coordinate import Coordinate
+from particle import EmitterDefinition, EmitterPool, RectParticle
+from replay import InputRecorder, Recording, state_checksum
+from scene_stack import REPLACE, SceneStack
+from scheduler import FrameScheduler
+
+
+def test_recording_round_trip(tmp_path):
+    recorder = InputRecorder(seed=7)
+    recorder.record(0, [pygame.event.Event(pygame.KEYDOWN, key=pygame.K_m, window=object())])
+    recorder.record(3, [])
+    path = tmp_path / "game.rec"
+    recorder.recording.save(path)
+
+    recording = Recording.load(path)
+    assert (recording.seed, recording.ticks) == (7, 4)
+    events = recording.events_by_tick()
+    assert [event.key for event in events[0]] == [pygame.K_m]
+    assert "window" not in events[0][0].dict
+
+
+def run_particles(seed: int, slow: bool) -> str:
+    random.seed(seed)
+    tick = 0
+
+    def clock() -> float:
+        return tick / 50
+
+    pool = EmitterPool(clock=clock)
+    definition = EmitterDefinition(RectParticle, 0.05, (200, 100, 50, 255), lifetime=0.5).with_kwargs(spread=5)
+    for tick in range(60):
+        if tick % 20 == 0:
+            pool.emit(definition, Coordinate(10, 10))
+        pool.update()
+        if slow:
+            sum(range(20_000))  # wall-clock speed must not matter
+    return state_checksum(tick, None)
+
+
+def test_tick_clock_makes_particles_deterministic():
+    assert run_particles(3, slow=False) == run_particles(3, slow=True)
+
+
+def test_replay_survives_fullscreen_toggle(tmp_path, monkeypatch):
+    import main  # pylint: disable=import-outside-toplevel
+
+    monkeypatch.chdir(tmp_path)  # keeps the config, log and recording files out of the repo
+    recorder = InputRecorder(seed=11)
+    recorder.record(0, [pygame.event.Event(pygame.KEYDOWN, key=pygame.K_f)])
+    recorder.record(2, [])
+    recorder.recording.save(tmp_path / "game.rec")
+
+    result = main.replay(tmp_path / "game.rec")
+    assert len(result.frame_times) == 3
+
+
+def test_game_scenes_seed_the_global_rng_when_entered():
+    import main  # pylint: disable=import-outside-toplevel
+
+    random.seed(5)
+    expected = state_checksum(0, None)
+
+    window = SimpleNamespace(tick=0)
+    scenes = SceneStack(FrameScheduler(frame_budget=1, fixed_steps=1))
+    scenes.push(main.init_game_scene(window, seed=5))  # type: ignore
+    assert state_checksum(0, None) == expected
+
+    random.seed(1)
+    scenes.preload(main.load_game_scene(window, seed=5), transition=REPLACE)  # type: ignore
+    while scenes.loading:
+        scenes.update()
+        scenes.scheduler.run_background(frame_start=0)
+    assert state_checksum(0, None) == expected
@@ -0,0 +1,109 @@
+# pylint: disable=missing-docstring
+
+import time
+
+from scene_stack import PUSH, REPLACE, SceneStack
+from scheduler import FrameScheduler, yield_now
+
+
+class DummyScene:
+    def __init__(self, name: str, log: list):
+        self.name = name
+        self.log = log
+        self.updates = 0
+
+    def update(self) -> None:
+        self.updates += 1
+
+    def render(self, screen) -> None:
+        ...
+
+    def handle_event(self, event) -> None:
+        ...
+
+    def enter(self) -> None:
+        self.log.append(("enter", self.name))
+
+    def suspend(self) -> None:
+        self.log.append(("suspend", self.name))
+
+    def resume(self) -> None:
+        self.log.append(("resume", self.name))
+
+    def exit(self) -> None:
+        self.log.append(("exit", self.name))
+
+
+def run_frame(scenes: SceneStack) -> None:
+    scenes.update()
+    scenes.scheduler.run_background(frame_start=time.perf_counter())
+
+
+def test_hooks_are_called_on_transitions():
+    log: list = []
+    scenes = SceneStack(FrameScheduler(frame_budget=1))
+    menu, game, pause = (DummyScene(name, log) for name in ("menu", "game", "pause"))
+
+    scenes.push(menu)
+    scenes.replace(game)
+    scenes.push(pause)
+    scenes.pop()
+
+    assert log == [
+        ("enter", "menu"),
+        ("exit", "menu"),
+        ("enter", "game"),
+        ("suspend", "game"),
+        ("enter", "pause"),
+        ("exit", "pause"),
+        ("resume", "game"),
+    ]
+    assert scenes.top is game
+
+
+def test_suspended_scenes_keep_state_without_updating():
+    scenes = SceneStack(FrameScheduler(frame_budget=1))
+    game, pause = DummyScene("game", []), DummyScene("pause", [])
+    scenes.push(game)
+    scenes.update()
+    scenes.push(pause)
+    scenes.update()
+    scenes.update()
+    assert (game.updates, pause.updates) == (1, 2)
+
+
+def test_preloaded_scene_is_swapped_in_on_frame_boundary():
+    log: list = []
+    scenes = SceneStack(FrameScheduler(frame_budget=1, fixed_steps=1))
+    menu = DummyScene("menu", log)
+    scenes.push(menu)
+
+    async def loader():
+        await yield_now()
+        await yield_now()
+        return DummyScene("game", log)
+
+    scenes.preload(loader(), transition=REPLACE)
+    for _ in range(3):
+        run_frame(scenes)
+        assert scenes.top is menu and scenes.loading
+
+    run_frame(scenes)
+    assert scenes.top.name == "game"  # type: ignore
+    assert menu.updates == 3
+    assert log == [("enter", "menu"), ("exit", "menu"), ("enter", "game")]
+    assert len(scenes) == 1
+
+
+def test_failed_preload_keeps_current_scene():
+    scenes = SceneStack(FrameScheduler(frame_budget=1))
+    menu = DummyScene("menu", [])
+    scenes.push(menu)
+
+    async def loader():
+        raise RuntimeError("missing asset")
+
+    scenes.preload(loader(), transition=PUSH)
+    run_frame(scenes)
+    run_frame(scenes)
+    assert scenes.top is menu and not scenes.loading
@@ -0,0 +1,62 @@
+# pylint: disable=missing-docstring
+
+import asyncio
+import time
+
+from scheduler import FrameScheduler, next_frame, yield_now
+
+
+def counting_step(frames: int):
+    count = [0]
+
+    def step() -> bool:
+        count[0] += 1
+        return count[0] < frames
+
+    return step
+
+
+def test_run_paces_frames_to_budget():
+    scheduler = FrameScheduler(frame_budget=0.01)
+    start = time.perf_counter()
+    scheduler.run(counting_step(10))
+    assert time.perf_counter() - start >= 0.085
+
+
+def test_run_async_paces_frames_to_budget():
+    scheduler = FrameScheduler(frame_budget=0.01)
+    start = time.perf_counter()
+    asyncio.run(scheduler.run_async(counting_step(10)))
+    assert time.perf_counter() - start >= 0.085
+
+
+def test_fixed_steps_are_independent_of_timing():
+    log = []
+
+    async def worker():
+        for index in range(10):
+            log.append(index)
+            await yield_now()
+
+    scheduler = FrameScheduler(frame_budget=0, fixed_steps=3)  # deadline already passed
+    scheduler.spawn(worker())
+    scheduler.run_background(frame_start=time.perf_counter())
+    assert log == [0, 1, 2]
+
+
+def test_next_frame_resumes_once_per_frame_and_returns_result():
+    frames = []
+
+    async def script():
+        for _ in range(3):
+            frames.append(scheduler.frame)
+            await next_frame()
+        return "done"
+
+    scheduler = FrameScheduler(frame_budget=1)
+    task = scheduler.spawn(script())
+    for _ in range(4):
+        scheduler.run_background(frame_start=time.perf_counter())
+    assert frames == [0, 1, 2]
+    assert task.done and task.result == "done"
+    assert scheduler.idle
@@ -0,0 +1,58 @@
+# pylint: disable=missing-docstring
+
+import pygame
+
+from coordinate import Coordinate
+from quad_tree import Rect
+from tilemap import ChunkCache, TileMap
+
+
+def make_surface(size: int) -> pygame.Surface:
+    return pygame.Surface((size, size), pygame.SRCALPHA)  # 4 bytes per pixel
+
+
+def test_chunk_cache_evicts_least_recently_used():
+    cache = ChunkCache(memory_budget=3 * 10 * 10 * 4)
+    for key in [(0, 0), (1, 0), (2, 0)]:
+        cache.put(key, make_surface(10))
+    assert cache.get((0, 0)) is not None  # (1, 0) is now the oldest
+
+    cache.put((3, 0), make_surface(10))
+
+    assert (1, 0) not in cache
+    assert (0, 0) in cache and (2, 0) in cache and (3, 0) in cache
+    assert cache.resident_bytes == 3 * 10 * 10 * 4
+    assert cache.stats.evictions == 1
+
+
+def test_chunk_cache_keeps_single_oversized_entry():
+    cache = ChunkCache(memory_budget=10)
+    cache.put((0, 0), make_surface(10))
+    assert len(cache) == 1
+
+
+def test_only_changed_chunks_are_rebaked():
+    tileset = [make_surface(4), make_surface(4)]
+    tileset[0].fill((255, 0, 0))
+    tileset[1].fill((0, 255, 0))
+    tile_map = TileMap([[0] * 10 for _ in range(10)], tileset, tile_size=4, chunk_size=3)
+    screen = pygame.Surface((40, 40))
+    view = Rect(Coordinate(), Coordinate(40, 40))
+
+    tile_map.render(screen, view)
+    assert tile_map.cache.stats.bakes == 16
+
+    tile_map.set_tile(5, 5, 1)
+    tile_map.render(screen, view)
+    assert tile_map.cache.stats.bakes == 17
+    assert screen.get_at((21, 21)) == (0, 255, 0, 255)
+
+    reference = pygame.Surface((40, 40))
+    tile_map.render_naive(reference, view)
+    assert pygame.image.tobytes(screen, "RGB") == pygame.image.tobytes(reference, "RGB")
+
+
+def test_render_is_culled_to_view():
+    tile_map = TileMap([[0] * 64 for _ in range(64)], [make_surface(8)], tile_size=8, chunk_size=16)
+    view = Rect(Coordinate(130, 0), Coordinate(100, 100))
+    assert list(tile_map.visible_chunks(view)) == [(1, 0)]
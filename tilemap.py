@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+"""Tilemap module, rendering static tile layers from pre-baked chunk surfaces"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Sequence, Set, Tuple
+
+import pygame
+
+from coordinate import Coordinate
+from quad_tree import Rect
+from surfaces import surface_bytes
+
+Surface = pygame.surface.Surface
+ChunkKey = Tuple[int, int]
+TileGrid = List[List[Optional[int]]]
+
+
+@dataclass
+class ChunkCacheStats:
+    hits: int = 0
+    bakes: int = 0
+    evictions: int = 0
+
+
+class ChunkCache:
+    """LRU cache of baked chunk surfaces, evicting under a memory budget in bytes"""
+
+    def __init__(self, memory_budget: int):
+        self.memory_budget = memory_budget
+        self.resident_bytes = 0
+        self.stats = ChunkCacheStats()
+        self._surfaces: OrderedDict[ChunkKey, Surface] = OrderedDict()
+
+    def __contains__(self, key: ChunkKey) -> bool:
+        return key in self._surfaces
+
+    def __len__(self) -> int:
+        return len(self._surfaces)
+
+    def get(self, key: ChunkKey) -> Optional[Surface]:
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.stats.hits += 1
+        return surface
+
+    def put(self, key: ChunkKey, surface: Surface) -> None:
+        self.discard(key)
+        self._surfaces[key] = surface
+        self.resident_bytes += surface_bytes(surface)
+        self.stats.bakes += 1
+        while self.resident_bytes > self.memory_budget and len(self._surfaces) > 1:
+            _, evicted = self._surfaces.popitem(last=False)
+            self.resident_bytes -= surface_bytes(evicted)
+            self.stats.evictions += 1
+
+    def discard(self, key: ChunkKey) -> None:
+        surface = self._surfaces.pop(key, None)
+        if surface is not None:
+            self.resident_bytes -= surface_bytes(surface)
+
+    def clear(self) -> None:
+        self._surfaces.clear()
+        self.resident_bytes = 0
+
+
+class TileMap:
+    """Static tile layer split into chunk_size x chunk_size tile chunks.
+
+    Chunks are baked into a surface on first use and re-baked only after one of
+    their tiles changed, so rendering costs a few blits per frame.
+    """
+
+    def __init__(
+        self,
+        tiles: TileGrid,
+        tileset: Sequence[Surface],
+        tile_size: int,
+        position: Coordinate = Coordinate(),
+        chunk_size: int = 16,
+        memory_budget: int = 32 * 1024 * 1024,
+    ):
+        self.tiles = tiles
+        self.tileset = tileset
+        self.tile_size = tile_size
+        self.position = position
+        self.chunk_size = chunk_size
+        self.cache = ChunkCache(memory_budget)
+        self._dirty: Set[ChunkKey] = set()
+
+    @property
+    def rows(self) -> int:
+        return len(self.tiles)
+
+    @property
+    def columns(self) -> int:
+        return len(self.tiles[0]) if self.tiles else 0
+
+    @property
+    def bounds(self) -> Rect:
+        return Rect(
+            self.position,
+            Coordinate(self.columns * self.tile_size, self.rows * self.tile_size),
+        )
+
+    def get_tile(self, column: int, row: int) -> Optional[int]:
+        return self.tiles[row][column]
+
+    def set_tile(self, column: int, row: int, tile: Optional[int]) -> None:
+        if self.tiles[row][column] == tile:
+            return
+        self.tiles[row][column] = tile
+        self._dirty.add((column // self.chunk_size, row // self.chunk_size))
+
+    def tile_at(self, point: Coordinate) -> Optional[Tuple[int, int]]:
+        """Returns the (column, row) of the tile under the world point, if any"""
+        column = int((point.x - self.position.x) // self.tile_size)
+        row = int((point.y - self.position.y) // self.tile_size)
+        if 0 <= column < self.columns and 0 <= row < self.rows:
+            return column, row
+        return None
+
+    def render(self, screen: Surface, view: Rect) -> None:
+        """Blits the chunks overlapping view, a rect in world coordinates"""
+        chunk_pixels = self.chunk_size * self.tile_size
+        for key in self.visible_chunks(view):
+            surface = self._get_chunk(key)
+            screen.blit(
+                surface,
+                (
+                    self.position.x + key[0] * chunk_pixels - view.position.x,
+                    self.position.y + key[1] * chunk_pixels - view.position.y,
+                ),
+            )
+
+    def render_naive(self, screen: Surface, view: Rect) -> None:
+        """Reference path blitting every visible tile, used for benchmarking"""
+        size = self.tile_size
+        first_column, last_column, first_row, last_row = self._visible_range(view, size)
+        for row in range(first_row, last_row):
+            tiles = self.tiles[row]
+            for column in range(first_column, last_column):
+                tile = tiles[column]
+                if tile is None:
+                    continue
+                screen.blit(
+                    self.tileset[tile],
+                    (
+                        self.position.x + column * size - view.position.x,
+                        self.position.y + row * size - view.position.y,
+                    ),
+                )
+
+    def visible_chunks(self, view: Rect) -> Iterator[ChunkKey]:
+        first_x, last_x, first_y, last_y = self._visible_range(
+            view, self.chunk_size * self.tile_size
+        )
+        for chunk_y in range(first_y, last_y):
+            for chunk_x in range(first_x, last_x):
+                yield chunk_x, chunk_y
+
+    def invalidate(self) -> None:
+        self.cache.clear()
+        self._dirty.clear()
+
+    def _visible_range(self, view: Rect, cell_size: int) -> Tuple[int, int, int, int]:
+        columns = -(-self.columns * self.tile_size // cell_size)
+        rows = -(-self.rows * self.tile_size // cell_size)
+        left = view.position.x - self.position.x
+        top = view.position.y - self.position.y
+        first_x = max(int(left // cell_size), 0)
+        first_y = max(int(top // cell_size), 0)
+        last_x = min(int(-(-(left + view.size.x) // cell_size)), columns)
+        last_y = min(int(-(-(top + view.size.y) // cell_size)), rows)
+        return first_x, last_x, first_y, last_y
+
+    def _get_chunk(self, key: ChunkKey) -> Surface:
+        if key in self._dirty:
+            self._dirty.discard(key)
+            self.cache.discard(key)
+        surface = self.cache.get(key)
+        if surface is None:
+            surface = self._bake_chunk(key)
+            self.cache.put(key, surface)
+        return surface
+
+    def _bake_chunk(self, key: ChunkKey) -> Surface:
+        size = self.tile_size
+        first_column = key[0] * self.chunk_size
+        first_row = key[1] * self.chunk_size
+        last_column = min(first_column + self.chunk_size, self.columns)
+        last_row = min(first_row + self.chunk_size, self.rows)
+
+        surface = pygame.Surface(
+            ((last_column - first_column) * size, (last_row - first_row) * size),
+            pygame.SRCALPHA,
+        )
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+
+        blits = [
+            (self.tileset[tile], ((column - first_column) * size, (row - first_row) * size))
+            for row in range(first_row, last_row)
+            for column, tile in enumerate(self.tiles[row][first_column:last_column], first_column)
+            if tile is not None
+        ]
+        surface.blits(blits, doreturn=False)
+        return surface
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    def make_tileset(tile_size: int, count: int) -> List[Surface]:
+        tileset = []
+        for _ in range(count):
+            tile = pygame.Surface((tile_size, tile_size))
+            tile.fill((random.randint(0, 255), random.randint(0, 255), random.randint(0, 255)))
+            tileset.append(tile)
+        return tileset
+
+    def benchmark(render, screen: Surface, views: List[Rect]) -> float:
+        start = time.perf_counter()
+        for view in views:
+            render(screen, view)
+        return (time.perf_counter() - start) / len(views)
+
+    def main():
+        pygame.init()
+        screen = pygame.display.set_mode((800, 600))
+        tile_size = 16
+        tileset = make_tileset(tile_size, 8)
+        tiles: TileGrid = [
+            [random.randrange(len(tileset)) for _ in range(256)] for _ in range(256)
+        ]
+        tile_map = TileMap(tiles, tileset, tile_size)
+        views = [
+            Rect(Coordinate(x * 3 % 3000, x * 2 % 3000), Coordinate(800, 600))
+            for x in range(500)
+        ]
+
+        tile_map.render(screen, views[0])  # warm up the chunk cache
+        naive = benchmark(tile_map.render_naive, screen, views)
+        chunked = benchmark(tile_map.render, screen, views)
+        print(f"Chunk blits per frame: {len(list(tile_map.visible_chunks(views[0])))}")
+        print(f"Naive per-tile render: {naive * 1000:.3f} ms/frame")
+        print(f"Chunked render: {chunked * 1000:.3f} ms/frame ({naive / chunked:.1f}x)")
+        print(f"Chunk cache: {tile_map.cache.stats}, {tile_map.cache.resident_bytes} bytes")
+        pygame.quit()
+
+    main()